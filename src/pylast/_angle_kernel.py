@@ -0,0 +1,15 @@
+"""
+Numba kernel behind helper.compute_angle_separation for array inputs.
+Kept in its own module so numba is only imported when it is needed, while
+the compiled kernel is still cached on disk between processes.
+"""
+import numba as nb
+from .helper import _angle_separation
+
+_angle_separation_jit = nb.njit(cache=True)(_angle_separation)
+
+@nb.njit(parallel=True, cache=True)
+def angle_separation_kernel(rec_alt, rec_az, true_alt, true_az, out):
+    # Single fused pass: no intermediate sin/cos temporaries
+    for i in nb.prange(out.size):
+        out[i] = _angle_separation_jit(rec_alt[i], rec_az[i], true_alt[i], true_az[i])
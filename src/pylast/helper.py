@@ -1,3 +1,4 @@
+import math
 import os
 import subprocess
 import sys
@@ -9,24 +10,41 @@ from ._pylast_imageprocessor import *
 from ._pylast_showerprocessor import *
 from ._pylast_datawriter import *
 from ._pystatistic import *
-try:
-    from ._pylast_databasewriter import DatabaseWriter as CDataBaseWriter
-except ImportError:
-    CDataBaseWriter = None
 import numpy as np
 
 
+def _angle_separation(rec_alt, rec_az, true_alt, true_az):
+    # Shared per-element expression: used directly for scalars and compiled by
+    # numba for the array kernel in _angle_kernel.py
+    if not (math.isfinite(rec_alt) and math.isfinite(rec_az)
+            and math.isfinite(true_alt) and math.isfinite(true_az)):
+        # math.sin/cos raise on inf; match numpy, which yields NaN
+        return math.nan
+    cos_angle = (math.sin(rec_alt) * math.sin(true_alt)
+                 + math.cos(rec_alt) * math.cos(true_alt) * math.cos(rec_az - true_az))
+    # Clamp rounding overshoot only, so a NaN direction stays NaN
+    if cos_angle > 1.0:
+        cos_angle = 1.0
+    elif cos_angle < -1.0:
+        cos_angle = -1.0
+    return math.degrees(math.acos(cos_angle))
 
 def compute_angle_separation(rec_alt, rec_az, true_alt, true_az):
-    sin_alt1 = np.sin(rec_alt)
-    sin_alt2 = np.sin(true_alt)
-    cos_alt1 = np.cos(rec_alt)
-    cos_alt2 = np.cos(true_alt)
-    cos_az_diff = np.cos(rec_az - true_az)
-    cos_angle = sin_alt1 * sin_alt2 + cos_alt1 * cos_alt2 * cos_az_diff
-    # Use np.clip for vectorized min/max operations
-    cos_angle = np.clip(cos_angle, -1.0, 1.0)
-    return np.degrees(np.arccos(cos_angle))
+    # Same output dtype as the numpy expression: float32 stays float32,
+    # everything else (float64, ints, Python floats) gives float64
+    dtype = np.result_type(rec_alt, rec_az, true_alt, true_az)
+    if dtype != np.float32:
+        dtype = np.dtype(np.float64)
+    if np.ndim(rec_alt) == 0 and np.ndim(rec_az) == 0 and np.ndim(true_alt) == 0 and np.ndim(true_az) == 0:
+        # Scalar inputs (the per-event case): plain math avoids ufunc and kernel launch overhead
+        return dtype.type(_angle_separation(float(rec_alt), float(rec_az), float(true_alt), float(true_az)))
+    # numba (and LLVM) is only loaded the first time array inputs are seen
+    from ._angle_kernel import angle_separation_kernel
+    rec_alt, rec_az, true_alt, true_az = np.broadcast_arrays(
+        *(np.asarray(a, dtype=dtype) for a in (rec_alt, rec_az, true_alt, true_az)))
+    out = np.empty(rec_alt.shape, dtype=dtype)
+    angle_separation_kernel(rec_alt.ravel(), rec_az.ravel(), true_alt.ravel(), true_az.ravel(), out.reshape(-1))
+    return out
 
 def register_exe(exename):
     # Get the path to the C++ executable
@@ -36,9 +54,27 @@ def register_exe(exename):
     
     
     # Forward all command line arguments to the C++ executable
+    if os.name == "posix":
+        # Replace the Python process with the executable: no extra fork, and the
+        # executable's exit status becomes the exit status of the entry point
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(executable, [executable] + sys.argv[1:])
     try:
         result = subprocess.run([executable] + sys.argv[1:], check=True)
         return result.returncode
     except subprocess.CalledProcessError as e:
         print(f"Error running {executable}: {e}", file=sys.stderr)
-        return e.returncode
\ No newline at end of file
+        return e.returncode
+
+def __getattr__(name):
+    # The database extension is optional and heavy to load, so it is only
+    # imported when CDataBaseWriter is first requested (PEP 562).
+    if name == "CDataBaseWriter":
+        try:
+            from ._pylast_databasewriter import DatabaseWriter as CDataBaseWriter
+        except ImportError:
+            CDataBaseWriter = None
+        globals()[name] = CDataBaseWriter
+        return CDataBaseWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,14 @@
 from .SimtelEventSource import SimtelEventSource
 from ..helper import DataWriter, RootEventSource
 
-try :
-    from .database_writer import DatabaseWriter
-except ImportError:
-    pass
+
+def __getattr__(name):
+    # Defer loading ibis and the database extension until DatabaseWriter is used
+    if name == "DatabaseWriter":
+        try:
+            from .database_writer import DatabaseWriter
+        except ImportError as e:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from e
+        globals()[name] = DatabaseWriter
+        return DatabaseWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,6 +6,7 @@ and adds functionality for reading data using ibis.
 
 import ibis
 import pandas as pd
+import pyarrow as pa
 from typing import Optional
 from ..helper import CDataBaseWriter
 
@@ -32,6 +33,9 @@ if CDataBaseWriter is not  None:
             self.db_file = db_file
             self._c_writer = CDataBaseWriter(db_file)
             self._conn: Optional[ibis.BaseBackend] = None
+            # Arrow tables are the canonical cache; DataFrames are thin views on them
+            self._event_arrow: Optional[pa.Table] = None
+            self._tel_arrow: Optional[pa.Table] = None
             self._event_df: Optional[pd.DataFrame] = None
             self._tel_df: Optional[pd.DataFrame] = None
         
@@ -42,6 +46,8 @@ if CDataBaseWriter is not  None:
                 event_source: Event source to write data from
             """
             self._c_writer.writeEventData(event_source, use_true)
+            # The read-only connection only sees data committed before it was opened
+            self._reset_cache()
 
         def __call__(self, event_source, use_true=False):
             """Write event data to the database (alias for write method).
@@ -52,39 +58,102 @@ if CDataBaseWriter is not  None:
             self.write(event_source, use_true)
         
         def _connect(self):
-            """Connect to the database using ibis."""
+            """Connect to the database using ibis.
+            
+            The connection is opened read-only, since all writes go through the
+            C++ writer, and is kept open until new data is written.
+            """
             if self._conn is None:
-                self._conn = ibis.connect(f"duckdb://{self.db_file}")
+                self._conn = ibis.duckdb.connect(self.db_file, read_only=True)
+        
+        def _reset_cache(self):
+            """Drop cached tables and close the read connection."""
+            self._event_arrow = None
+            self._tel_arrow = None
+            self._event_df = None
+            self._tel_df = None
+            if self._conn is not None:
+                self._conn.disconnect()
+                self._conn = None
+        
+        @staticmethod
+        def _arrow_to_pandas(table: pa.Table) -> pd.DataFrame:
+            """Convert an Arrow table to an Arrow-backed pandas DataFrame.
+            
+            Columns keep their Arrow buffers (``pd.ArrowDtype``) instead of being
+            copied into NumPy blocks, so the DataFrame shares memory with the
+            cached table.
+            """
+            return table.to_pandas(types_mapper=pd.ArrowDtype, split_blocks=True)
+        
+        def _join_query(self, left: str, right: str, keys: tuple = ("source_file", "event_id")) -> str:
+            """Build the SQL for joining two tables on ``keys`` inside DuckDB.
+            
+            ``event_id`` is only unique within one source file, and the C++
+            writer appends every file into the same tables, so rows are matched
+            on ``(source_file, event_id)``. The selected columns follow ibis'
+            join naming: key columns appear once and other columns present in
+            both tables get a ``_right`` suffix.
+            
+            Args:
+                left: Name of the left table
+                right: Name of the right table
+                keys: Columns to join on
+                
+            Returns:
+                SQL query string
+            """
+            left_columns = self._conn.table(left).columns
+            right_columns = self._conn.table(right).columns
+            select = [f'l."{col}"' for col in left_columns]
+            select += [f'r."{col}" AS "{col}_right"' if col in left_columns else f'r."{col}"'
+                       for col in right_columns if col not in keys]
+            using = ", ".join(f'"{key}"' for key in keys)
+            return (f'SELECT {", ".join(select)} FROM "{left}" AS l '
+                    f'JOIN "{right}" AS r USING ({using})')
+        
+        def _fetch_arrow(self, query: str) -> pa.Table:
+            """Run a query on the underlying DuckDB connection and fetch it as Arrow.
+            
+            Args:
+                query: SQL query string
+                
+            Returns:
+                Arrow table with the query result
+            """
+            return self._conn.con.sql(query).fetch_arrow_table()
         
         def _load_event_data(self):
             """Load event data (SimulatedShower and ReconstructedEvent tables) and join them."""
-            if self._event_df is None:
+            if self._event_arrow is None:
                 self._connect()
                 
-                # Load tables
-                sim_shower = self._conn.table("SimulatedShower")
-                reco_event = self._conn.table("ReconstructedEvent")
-                
-                # Join tables on event_id
-                joined = sim_shower.join(reco_event, "event_id")
-                
-                # Convert to pandas DataFrame
-                self._event_df = joined.to_pandas()
+                # Join tables on (source_file, event_id) within DuckDB
+                self._event_arrow = self._fetch_arrow(self._join_query("SimulatedShower", "ReconstructedEvent"))
         
         def _load_telescope_data(self):
-            """Load telescope data (Telescope and SimulatedShower tables) and join them."""
-            if self._tel_df is None:
+            """Load telescope data (Telescope and SimulatedShower tables) and join them.
+            
+            Telescope holds one row per telescope per event while SimulatedShower
+            holds one row per event, so the shower table is kept on the build
+            (right) side of DuckDB's hash join and the telescope rows stream
+            through the probe.
+            """
+            if self._tel_arrow is None:
                 self._connect()
                 
-                # Load tables
-                telescope = self._conn.table("Telescope")
-                sim_shower = self._conn.table("SimulatedShower")
-                
-                # Join tables on event_id
-                joined = telescope.join(sim_shower, "event_id")
-                
-                # Convert to pandas DataFrame
-                self._tel_df = joined.to_pandas()
+                # Join tables on (source_file, event_id) within DuckDB
+                self._tel_arrow = self._fetch_arrow(self._join_query("Telescope", "SimulatedShower"))
+        
+        @property
+        def event_table(self) -> pa.Table:
+            """Return an Arrow table containing SimulatedShower and ReconstructedEvent data.
+            
+            Returns:
+                Arrow table with merged SimulatedShower and ReconstructedEvent data
+            """
+            self._load_event_data()
+            return self._event_arrow
         
         @property
         def event_df(self) -> pd.DataFrame:
@@ -93,9 +162,20 @@ if CDataBaseWriter is not  None:
             Returns:
                 DataFrame with merged SimulatedShower and ReconstructedEvent data
             """
-            self._load_event_data()
+            if self._event_df is None:
+                self._event_df = self._arrow_to_pandas(self.event_table)
             return self._event_df
         
+        @property
+        def tel_table(self) -> pa.Table:
+            """Return an Arrow table containing Telescope and SimulatedShower data.
+            
+            Returns:
+                Arrow table with merged Telescope and SimulatedShower data
+            """
+            self._load_telescope_data()
+            return self._tel_arrow
+        
         @property
         def tel_df(self) -> pd.DataFrame:
             """Return a DataFrame containing Telescope and SimulatedShower data.
@@ -103,12 +183,12 @@ if CDataBaseWriter is not  None:
             Returns:
                 DataFrame with merged Telescope and SimulatedShower data
             """
-            self._load_telescope_data()
+            if self._tel_df is None:
+                self._tel_df = self._arrow_to_pandas(self.tel_table)
             return self._tel_df
         
         def clear_tables(self):
             """Clear all data from the database tables."""
             self._c_writer.clearTables()
             # Clear cached data
-            self._event_df = None
-            self._tel_df = None
\ No newline at end of file
+            self._reset_cache()
\ No newline at end of file
@@ -7,12 +7,17 @@ Written by:
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-from matplotlib.patches import Circle, Rectangle, Ellipse
+from matplotlib.patches import Ellipse
+from matplotlib.collections import PolyCollection
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
+from functools import partial
 import sys
 
+# 相机图像色图：plasma，未触亮像素 (PE < 1) 显示为白色，所有望远镜共用
+CAMERA_CMAP = plt.cm.plasma.with_extremes(under='white')
+
 # ==================== 数据模型定义 ====================
 @dataclass
 class TelescopeGeometry:
@@ -49,27 +54,38 @@ class HillasParameters:
     cog_x: float  # 重心X (cm)
     cog_y: float  # 重心Y (cm)
 
+def _cm_to_deg(x, focal_length: float):
+    """焦面坐标 (cm) -> 视场角 (deg)"""
+    return np.degrees(np.arctan(np.asarray(x) / focal_length))
+
+def _deg_to_cm(deg, focal_length: float):
+    """视场角 (deg) -> 焦面坐标 (cm)"""
+    return np.tan(np.radians(np.asarray(deg))) * focal_length
+
 def read_event_data(event, tel_geoms: Dict[int, TelescopeGeometry]) -> EventData:
     """从事件对象提取结构化数据"""
-    pe_data = {}
-    sum_pe = []
-    for tel_id in tel_geoms:
-        pe_data[tel_id] = event.simulation.tels[tel_id].true_image
-        sum_pe.append(event.simulation.tels[tel_id].true_image_sum)
+    # tels 每次访问都会重新构建字典，只取一次；shower 同样只取一次
+    simulation = event.simulation
+    sim_tels = simulation.tels
+    shower = simulation.shower
+    pe_data = {tel_id: sim_tels[tel_id].true_image for tel_id in tel_geoms}
+    # true_image_sum 即 true_image 的总和，预分配一次完成，无需逐个 np.sum
+    sum_pe = np.fromiter((sim_tels[tel_id].true_image_sum for tel_id in tel_geoms),
+                         dtype=np.float64, count=len(tel_geoms))
     
-    triggered = np.array([tel_id for tel_id, pe in pe_data.items() if np.sum(pe) > 0])
+    triggered = np.fromiter(tel_geoms, dtype=np.int64, count=len(tel_geoms))[sum_pe > 0]
     
     return EventData(
         event_id=getattr(event, 'count', 0),
-        mce0=event.simulation.shower.energy,
-        mcxcore=event.simulation.shower.core_x,
-        mcycore=event.simulation.shower.core_y,
-        mcze=event.simulation.shower.alt * 180 / np.pi,
-        mcaz=event.simulation.shower.az * 180 / np.pi,
-        xmax=event.simulation.shower.x_max,
-        hini=event.simulation.shower.h_first_int,
+        mce0=shower.energy,
+        mcxcore=shower.core_x,
+        mcycore=shower.core_y,
+        mcze=shower.alt * 180 / np.pi,
+        mcaz=shower.az * 180 / np.pi,
+        xmax=shower.x_max,
+        hini=shower.h_first_int,
         pe_data=pe_data,
-        sum_pe=np.array(sum_pe),
+        sum_pe=sum_pe,
         triggered_tels=triggered
     )
 
@@ -220,32 +236,73 @@ class Visualizer:
     def _load_telescope_data(self):
         """加载望远镜几何数据"""
         self.tel_geoms = {}
-        for tel_id, tel_coord in self.source_data.subarray.tel_positions.items():
+        # subarray 的属性每次访问都会把整个容器转换一遍，这里只取一次
+        subarray = self.source_data.subarray
+        tels = subarray.tels
+        tel_coords = subarray.tel_positions
+        self._tel_id_to_idx = {}
+        self._tel_positions = np.empty((0, 2))
+        self._pix_verts = {}
+        self._camera_limits = {}
+        if not tel_coords:
+            # 空阵列：np.concatenate 不接受空列表，直接保留空的几何信息
+            return
+        geometries = {tel_id: tels[tel_id].camera.geometry for tel_id in tel_coords}
+        
+        # 所有望远镜的像素坐标拼接为一块连续缓冲区 (CSR: 数据 + 偏移)，
+        # 单位换算只做一次，各望远镜的 pix_x/pix_y/pix_size 均为其中的切片视图
+        n_pixels = [len(geometry.pix_x) for geometry in geometries.values()]
+        self._pix_offsets = np.concatenate(([0], np.cumsum(n_pixels))).astype(np.intp)
+        self._pix_x_flat = np.concatenate([geometry.pix_x for geometry in geometries.values()]).astype(np.float64) * 100
+        self._pix_y_flat = np.concatenate([geometry.pix_y for geometry in geometries.values()]).astype(np.float64) * 100
+        self._pix_size_flat = np.sqrt(np.concatenate([geometry.pix_area for geometry in geometries.values()]).astype(np.float64)) * 100
+        # 几何不随事件变化：所有像素方块的 (N, 4, 2) 顶点一次性构建
+        half = self._pix_size_flat / 2
+        x, y = self._pix_x_flat, self._pix_y_flat
+        self._pix_verts_flat = np.stack([
+            np.stack([x - half, y - half], axis=-1),
+            np.stack([x + half, y - half], axis=-1),
+            np.stack([x + half, y + half], axis=-1),
+            np.stack([x - half, y + half], axis=-1),
+        ], axis=1)
+        
+        for i, (tel_id, tel_coord) in enumerate(tel_coords.items()):
+            start, stop = self._pix_offsets[i], self._pix_offsets[i + 1]
+            self._pix_verts[tel_id] = self._pix_verts_flat[start:stop]
             self.tel_geoms[tel_id] = TelescopeGeometry(
                 tel_id=tel_id,
                 pos_x=tel_coord[0],
                 pos_y=tel_coord[1],
-                focal_length=self.source_data.subarray.tels[tel_id].optics.equivalent_focal_length * 100,
-                pix_x=self.source_data.subarray.tels[tel_id].camera.geometry.pix_x * 100,
-                pix_y=self.source_data.subarray.tels[tel_id].camera.geometry.pix_y * 100,
-                pix_size=np.sqrt(self.source_data.subarray.tels[tel_id].camera.geometry.pix_area) * 100
+                focal_length=tels[tel_id].optics.equivalent_focal_length * 100,
+                pix_x=self._pix_x_flat[start:stop],
+                pix_y=self._pix_y_flat[start:stop],
+                pix_size=self._pix_size_flat[start:stop]
+            )
+            tel_geom = self.tel_geoms[tel_id]
+            margin = tel_geom.pix_size.max()
+            self._camera_limits[tel_id] = (
+                (tel_geom.pix_x.min() - margin, tel_geom.pix_x.max() + margin),
+                (tel_geom.pix_y.min() - margin, tel_geom.pix_y.max() + margin),
             )
+        # 望远镜ID -> 数组下标，加载时构建一次，避免每次绘图逐个比较
+        self._tel_id_to_idx = {tel_id: i for i, tel_id in enumerate(self.tel_geoms)}
+        self._tel_positions = np.array([(geom.pos_x, geom.pos_y) for geom in self.tel_geoms.values()])
     
     def visualize_telpos(self, event, output_path: Optional[str] = None):
         """
         可视化望远镜位置和触发情况
         Args:
             event: 直接传入的事件数据对象
-            output_path: 输出文件路径(可选)
+            output_path: 输出文件路径(可选)，指定时只保存不显示
         """
         event_data = read_event_data(event, self.tel_geoms)
         
         # 准备数据
-        tel_positions = np.array([(geom.pos_x, geom.pos_y) for geom in self.tel_geoms.values()])
-        x = tel_positions[:, 0]
-        y = tel_positions[:, 1]
+        x = self._tel_positions[:, 0]
+        y = self._tel_positions[:, 1]
         log_npe = np.log10(np.clip(event_data.sum_pe, 1, None))
-        triggered = np.isin([tel.tel_id for tel in self.tel_geoms.values()], event_data.triggered_tels)
+        triggered = np.zeros(len(self.tel_geoms), dtype=bool)
+        triggered[[self._tel_id_to_idx[tel_id] for tel_id in event_data.triggered_tels]] = True
         
         # 创建图形
         fig, ax = plt.subplots(figsize=(10, 8))
@@ -272,20 +329,18 @@ class Visualizer:
         ax.set_ylabel("Y Position (m)")
         ax.set_title("Telescope Positions and Shower Core")
         ax.legend()
-        cbar = fig.colorbar(scatter, ax=ax, label="log(NPE)")
+        fig.colorbar(scatter, ax=ax, label="log(NPE)")
         plt.xlim(-850, 850)
         plt.ylim(-850, 850)
         
-        if output_path:
-            plt.savefig(output_path, dpi=600)
-        plt.show()
+        self._finish_figure(fig, output_path)
     
     def visualize_event(self, event, output_path: Optional[str] = None):
         """
         可视化事件图像
         Args:
             event: 直接传入的事件数据对象
-            output_path: 输出文件路径(可选)
+            output_path: 输出文件路径(可选)，指定时只保存不显示
         """
         event_data = read_event_data(event, self.tel_geoms)
         hillas_params = self._get_hillas_parameters(event)
@@ -301,19 +356,17 @@ class Visualizer:
         fig, axes = plt.subplots(num_rows, num_cols, figsize=(6 * num_cols + 2, 6 * num_rows))
         axes = axes.flatten() if num_triggered > 1 else [axes]
         
-        colors = ['white'] + plt.cm.plasma(np.linspace(0, 1, 256)).tolist()
-        cmap = mcolors.ListedColormap(colors)
-        
         for i, tel_id in enumerate(event_data.triggered_tels):
             ax = axes[i+1]
             tel_geom = self.tel_geoms[tel_id]
             pe_data = event_data.pe_data[tel_id]
             
-            max_pe = np.max(pe_data)
-            bounds = [0, 1] + np.linspace(1, max_pe, 256).tolist()
-            norm = mcolors.BoundaryNorm(bounds, cmap.N)
+            # 均匀刻度无需逐个边界的 BoundaryNorm；PE < 1 的像素落在 under 区显示为白色
+            # vmax <= vmin 时 Normalize 会把所有值映射为 0 (包括 PE = 0)，需保证区间非空
+            norm = mcolors.Normalize(vmin=1, vmax=max(np.max(pe_data), 2))
             
-            self._draw_camera_image(ax, tel_geom, pe_data, norm, cmap)
+            self._draw_camera_image(ax, tel_geom.focal_length, self._pix_verts[tel_id],
+                                    self._camera_limits[tel_id], pe_data, norm, CAMERA_CMAP)
             
             if tel_id in hillas_params:
                 self._draw_hillas_ellipse(ax, hillas_params[tel_id])
@@ -337,9 +390,16 @@ class Visualizer:
             ax.axis('off')
             
         plt.tight_layout(pad=1.0)
+        self._finish_figure(fig, output_path)
+    
+    @staticmethod
+    def _finish_figure(fig, output_path: Optional[str] = None):
+        """保存或显示图像：指定输出路径时只写文件并释放图像，不进入 GUI 事件循环"""
         if output_path:
-            plt.savefig(output_path, dpi=600)
-        plt.show()
+            fig.savefig(output_path, dpi=600)
+            plt.close(fig)
+        else:
+            plt.show()
     
     def _get_hillas_parameters(self, event) -> Dict[int, HillasParameters]:
         """从事件对象提取Hillas参数"""
@@ -347,17 +407,16 @@ class Visualizer:
         if not hasattr(event, 'dl1') or event.dl1 is None or not hasattr(event.dl1, 'tels'):
             return {}
         
-        # 添加对tels是否为空的检查
-        if not event.dl1.tels:
+        # 添加对tels是否为空的检查 (tels 每次访问都会重新构建字典，只取一次)
+        dl1_tels = event.dl1.tels
+        if not dl1_tels:
             return {}
             
         hillas_params = {}
-        for tel_id, dl1 in event.dl1.tels.items():
+        for tel_id, dl1 in dl1_tels.items():
             # 确保望远镜存在于几何信息中
             if tel_id not in self.tel_geoms:
                 continue
-                
-            tel_geom = self.tel_geoms[tel_id]
             
             # 检查hillas参数是否存在
             if not hasattr(dl1, 'image_parameters') or not hasattr(dl1.image_parameters, 'hillas'):
@@ -373,40 +432,41 @@ class Visualizer:
             )
         return hillas_params
     
-    def _draw_camera_image(self, ax, tel_geom: TelescopeGeometry,
+    def _draw_camera_image(self, ax, focal_length: float, pix_verts: np.ndarray,
+                         limits: Tuple[Tuple[float, float], Tuple[float, float]],
                          pe_data: np.ndarray, norm, cmap):
-        """绘制相机图像"""
-        for x, y, size, pe in zip(tel_geom.pix_x, tel_geom.pix_y, tel_geom.pix_size, pe_data):
-            color = cmap(norm(pe))
-            rect = Rectangle((x-size/2, y-size/2), size, size,
-                           facecolor=color, edgecolor='k')
-            ax.add_patch(rect)
-            
-        ax.set_xlim(tel_geom.pix_x.min()-tel_geom.pix_size.max(),
-                   tel_geom.pix_x.max()+tel_geom.pix_size.max())
-        ax.set_ylim(tel_geom.pix_y.min()-tel_geom.pix_size.max(),
-                   tel_geom.pix_y.max()+tel_geom.pix_size.max())
+        """
+        绘制相机图像
+        Args:
+            focal_length: 焦距 (cm)
+            pix_verts: 像素方块顶点 (N, 4, 2) (cm)
+            limits: 坐标轴范围 ((xmin, xmax), (ymin, ymax)) (cm)
+        """
+        # 所有像素由单个集合统一着色绘制
+        pixels = PolyCollection(pix_verts, array=np.asarray(pe_data),
+                                cmap=cmap, norm=norm, edgecolors='k')
+        ax.add_collection(pixels)
+        
+        xlim, ylim = limits
+        ax.set_xlim(*xlim)
+        ax.set_ylim(*ylim)
         ax.set_aspect('equal')
         ax.set_xlabel('X Position (cm)')
         ax.set_ylabel('Y Position (cm)')
         
-        # 添加角度坐标轴
-        secax_x = ax.secondary_xaxis('top',
-            functions=(lambda x: np.degrees(np.arctan(x / tel_geom.focal_length)),
-                      lambda x: np.tan(np.radians(x)) * tel_geom.focal_length))
+        # 添加角度坐标轴 (X/Y 共用同一对换算函数)
+        cm_deg_functions = (partial(_cm_to_deg, focal_length=focal_length),
+                            partial(_deg_to_cm, focal_length=focal_length))
+        secax_x = ax.secondary_xaxis('top', functions=cm_deg_functions)
         secax_x.set_xlabel('X (degrees)')
         
-        secax_y = ax.secondary_yaxis('right',
-            functions=(lambda y: np.degrees(np.arctan(y / tel_geom.focal_length)),
-                      lambda y: np.tan(np.radians(y)) * tel_geom.focal_length))
+        secax_y = ax.secondary_yaxis('right', functions=cm_deg_functions)
         secax_y.set_ylabel('Y (degrees)')
         
         # 添加颜色条
         divider = make_axes_locatable(ax)
         cax = divider.append_axes("right", size="5%", pad=0.6)
-        sm = plt.cm.ScalarMappable(cmap=cmap, norm=norm)
-        sm.set_array([])
-        plt.colorbar(sm, cax=cax, label='PE')
+        plt.colorbar(pixels, cax=cax, label='PE', extend='min')
     
     def _draw_hillas_ellipse(self, ax, hillas: HillasParameters):
         """绘制Hillas椭圆"""